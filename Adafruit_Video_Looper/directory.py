@@ -5,29 +5,63 @@ import os
 
 class DirectoryReader:
 
+    # Report a change after this many unchanged checks anyway, to catch edits
+    # the directory snapshot can't see (e.g. vfat's coarse or missing mtimes).
+    FORCED_CHANGE_CHECKS = 30
+
     def __init__(self, config):
         """Create an instance of a file reader that just reads a single
         directory on disk.
         """
         self._load_config(config)
-        self._filecount = self.count_files()
+        self._snapshot = self._take_snapshot()
+        self._unchanged_checks = 0
 
     def _load_config(self, config):
         self._path = config.get('directory', 'path')
+        # Files whose contents change the playlist without touching the
+        # directory: the m3u playlist and the volume files.
+        self._watched_files = []
+        if config.has_option('playlist', 'path') and config.get('playlist', 'path'):
+            self._watched_files.append(os.path.join(self._path, config.get('playlist', 'path')))
+        for section, option in (('alsa', 'hw_vol_file'), ('omxplayer', 'sound_vol_file')):
+            if config.has_option(section, option) and config.get(section, option):
+                self._watched_files.append(os.path.join(self._path, config.get(section, option)))
 
     def search_paths(self):
         """Return a list of paths to search for files."""
         return [self._path]
 
     def is_changed(self):
-        """Return true if the number of files in the paths have changed."""
-        current_count = self.count_files()
-        if current_count != self._filecount:
-            self._filecount = current_count
+        """Return true if the directory or the playlist and volume files
+        changed, and at least every FORCED_CHANGE_CHECKS calls.
+        """
+        current_snapshot = self._take_snapshot()
+        self._unchanged_checks += 1
+        if current_snapshot != self._snapshot or self._unchanged_checks >= self.FORCED_CHANGE_CHECKS:
+            self._snapshot = current_snapshot
+            self._unchanged_checks = 0
             return True
         else:
             return False
 
+    def _take_snapshot(self):
+        """Return the modification times of the directory and the watched
+        files (None for missing ones) along with the number of files in the
+        directory.
+        """
+        mtimes = []
+        for path in [self._path] + self._watched_files:
+            try:
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        try:
+            count = self.count_files()
+        except OSError:
+            count = None
+        return (tuple(mtimes), count)
+
     def idle_message(self):
         """Return a message to display when idle and no files are found."""
         return 'No files found in {0}'.format(self._path)
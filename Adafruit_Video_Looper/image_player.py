@@ -21,9 +21,7 @@ class ImagePlayer:
                                  .split(',')
         self._duration = config.getint('image_player', 'duration')
         self._size = (pygame.display.Info().current_w, pygame.display.Info().current_h)
-        self._bgcolor = list(map(int, config.get('video_looper', 'bgcolor')
-                                        .translate(str.maketrans('','', ','))
-                                        .split()))
+        self._bgcolor = [int(x) for x in config.get('video_looper', 'bgcolor').split(',')]
         self._scale = config.getboolean('image_player', 'scale') 
         self._center = config.getboolean('image_player', 'center') 
         self._wait_time = config.getint('video_looper', 'wait_time')
@@ -55,6 +55,7 @@ class Playlist:
         self._movies = movies
         self._index = None
         self._next = None
+        self._sig = None
 
     def get_next(self, is_random, resume = False) -> Movie:
         """Get the next movie in the playlist. Will loop to start of playlist
@@ -124,6 +125,14 @@ class Playlist:
         """Return the number of movies in the playlist."""
         return len(self._movies)
 
+    def signature(self):
+        """Return a hash of the movie targets and repeat counts, for cheaply
+        checking if two playlists hold the same movies.
+        """
+        if self._sig is None:
+            self._sig = hash(tuple((movie.target, movie.repeats) for movie in self._movies))
+        return self._sig
+
     def clear_all_playcounts(self):
         for movie in self._movies:
             movie.clear_playcount()
\ No newline at end of file
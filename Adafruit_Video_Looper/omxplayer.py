@@ -2,12 +2,14 @@ import os
 import shutil
 import subprocess
 import tempfile
+import threading
 import time
 
 class VLCPlayer:
 
-    def __init__(self, config):
+    def __init__(self, config, on_finished=None):
         self._process = None
+        self._on_finished = on_finished
         self._temp_directory = None
         self._load_config(config)
 
@@ -52,6 +54,13 @@ class VLCPlayer:
         # Run VLC process and direct standard output to /dev/null.
         # Establish input pipe for commands
         self._process = subprocess.Popen(args, stdout=open(os.devnull, 'wb'), close_fds=True)
+        # Notify the looper as soon as VLC exits instead of waiting to be polled.
+        if self._on_finished is not None:
+            threading.Thread(target=self._wait_for_exit, args=(self._process,), daemon=True).start()
+
+    def _wait_for_exit(self, process):
+        process.wait()
+        self._on_finished()
 
     def pause(self):
         self.sendKey("p")
@@ -87,4 +96,4 @@ class VLCPlayer:
         return False
 
 def create_player(config, **kwargs):
-    return VLCPlayer(config)
+    return VLCPlayer(config, on_finished=kwargs.get('on_finished'))
@@ -34,6 +34,9 @@ class USBDriveReaderCopy(object):
         self._fgcolor = (149,193,26)
         self._bordercolor = (255,255,255)
         self._fontcolor = (255,255,255)
+        # The looper only initializes the font module once it draws text itself.
+        if not pygame.font.get_init():
+            pygame.font.init()
         self._font = pygame.font.Font(None, 40)
 
         #positions and sizes:
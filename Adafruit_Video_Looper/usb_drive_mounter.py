@@ -63,13 +63,17 @@ class USBDriveMounter:
         """Check for changes to USB drives.  Returns true if there was a USB 
         drive change, otherwise false.
         """
-        # Look for a drive change.
+        # Drain all pending events so a drive with several partitions only
+        # counts as one change.
+        changed = False
         device = self._monitor.poll(0)
-        # If a USB drive changed (added/remove) remount all drives.
-        if device is not None and device['ID_BUS'] == 'usb':
-            return True
-        # Else nothing changed.
-        return False
+        while device is not None:
+            # If a USB drive changed (added/remove) remount all drives.  Non-USB
+            # devices like SD cards or loop devices have no ID_BUS.
+            if device.get('ID_BUS') == 'usb':
+                changed = True
+            device = self._monitor.poll(0)
+        return changed
 
 
 if __name__ == '__main__':
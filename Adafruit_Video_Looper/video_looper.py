@@ -12,15 +12,17 @@ import signal
 import time
 import pygame
 import json
-import threading
+from operator import attrgetter
 from datetime import datetime
-import RPi.GPIO as GPIO
 
 from .alsa_config import parse_hw_device
 from .model import Playlist, Movie
 from .playlist_builders import build_playlist_m3u
 from datetime import datetime
-import vlc
+
+
+# Event posted from GPIO, player and signal callbacks to wake up the main loop.
+WAKEUP_EVENT = pygame.USEREVENT
 
 # Basic video looper architecure:
 #
@@ -76,19 +78,15 @@ class VideoLooper:
         self._bottom_datetime_display_format = self._config.get('video_looper', 'bottom_datetime_display_format', raw=True)
         # Parse string of 3 comma separated values like "255, 255, 255" into
         # a list of ints for colors.
-        self._bgcolor = list(map(int, self._config.get('video_looper', 'bgcolor')
-                                             .translate(str.maketrans('','', ','))
-                                             .split()))
-        self._fgcolor = list(map(int, self._config.get('video_looper', 'fgcolor')
-                                             .translate(str.maketrans('','', ','))
-                                             .split()))
+        self._bgcolor = [int(x) for x in self._config.get('video_looper', 'bgcolor').split(',')]
+        self._fgcolor = [int(x) for x in self._config.get('video_looper', 'fgcolor').split(',')]
         # Initialize pygame and display a blank screen.
         pygame.display.init()
-        pygame.font.init()
         pygame.mouse.set_visible(False)
         self._screen = pygame.display.set_mode((0,0), pygame.FULLSCREEN | pygame.NOFRAME)
         self._size = (pygame.display.Info().current_w, pygame.display.Info().current_h)
         self._bgimage = self._load_bgimage()  # A tuple with pyimage, xpos, ypos
+        self._has_bgimage = self._bgimage[0] is not None
         self._blank_screen()
         # Load configured video player and file reader modules.
         self._player = self._load_player()
@@ -106,20 +104,19 @@ class VideoLooper:
         self._sound_vol = 0
         # Set other static internal state.
         self._extensions = '|'.join(self._player.supported_extensions())
-        self._small_font = pygame.font.Font(None, 50)
-        self._medium_font   = pygame.font.Font(None, 96)
-        self._big_font   = pygame.font.Font(None, 250)
+        self._ext_re = re.compile(r'\.(' + self._extensions + r')$', re.IGNORECASE)
+        self._repeat_re = re.compile(r'_repeat_([0-9]*)x', re.IGNORECASE)
+        # Fonts are created on first use so the font module is never loaded
+        # when nothing is drawn on screen.
+        self._fonts = {}
         self._running    = True
         # set the inital playback state according to the startup setting.
         self._playbackStopped = not self._play_on_startup
         # Used for not waiting the first time
         self._firstStart = True
 
-        # Start keyboard handler thread:
-        # Event handling for key press, if keyboard control is enabled
-        if self._keyboard_control:
-            self._keyboard_thread = threading.Thread(target=self._handle_keyboard_shortcuts, daemon=True)
-            self._keyboard_thread.start()
+        # Key presses are handled by the main loop in run().
+        self._key_actions = self._build_key_actions()
         
         pinMapSetting = self._config.get('control', 'gpio_pin_map', raw=True)
         if pinMapSetting:
@@ -141,7 +138,7 @@ class VideoLooper:
     def _load_player(self):
         """Load the configured video player and return an instance of it."""
         module = self._config.get('video_looper', 'video_player')
-        return importlib.import_module('.' + module, 'Adafruit_Video_Looper').create_player(self._config, screen=self._screen, bgimage=self._bgimage)
+        return importlib.import_module('.' + module, 'Adafruit_Video_Looper').create_player(self._config, screen=self._screen, bgimage=self._bgimage, on_finished=self._wake_up)
         # Load VLCPlayer instead of OMXPlayer
         #from .omxplayer import VLCPlayer
         #return VLCPlayer(self._config, self._screen, self._bgimage)
@@ -162,6 +159,10 @@ class VideoLooper:
             if imagepath != "" and os.path.isfile(imagepath):
                 self._print('Using ' + str(imagepath) + ' as a background')
                 image = pygame.image.load(imagepath)
+                # smoothscale needs a 24 or 32 bit surface, so scale from a
+                # 32 bit copy and keep any transparency the image has.
+                has_alpha = bool(image.get_flags() & pygame.SRCALPHA) or image.get_colorkey() is not None
+                image = image.convert_alpha() if has_alpha else image.convert(32)
 
                 screen_w, screen_h = self._size
                 image_w, image_h = image.get_size()
@@ -172,26 +173,23 @@ class VideoLooper:
                 if screen_aspect_ratio < photo_aspect_ratio:  # Width is binding
                     new_image_w = screen_w
                     new_image_h = int(new_image_w / photo_aspect_ratio)
-                    image = pygame.transform.scale(image, (new_image_w, new_image_h))
+                    image = pygame.transform.smoothscale(image, (new_image_w, new_image_h))
                     image_y = (screen_h - new_image_h) // 2
 
                 elif screen_aspect_ratio > photo_aspect_ratio:  # Height is binding
                     new_image_h = screen_h
                     new_image_w = int(new_image_h * photo_aspect_ratio)
-                    image = pygame.transform.scale(image, (new_image_w, new_image_h))
+                    image = pygame.transform.smoothscale(image, (new_image_w, new_image_h))
                     image_x = (screen_w - new_image_w) // 2
 
                 else:  # Images have the same aspect ratio
-                    image = pygame.transform.scale(image, (screen_w, screen_h))
+                    image = pygame.transform.smoothscale(image, (screen_w, screen_h))
 
-        return (image, image_x, image_y)
+                # Convert to the display pixel format once so every later blit
+                # takes SDL's fast path.
+                image = image.convert_alpha() if has_alpha else image.convert()
 
-    def _is_number(self, s):
-        try:
-            float(s)
-            return True
-        except ValueError:
-            return False
+        return (image, image_x, image_y)
 
     def _build_playlist(self):
         """Try to build a playlist (object) from a playlist (file).
@@ -239,48 +237,102 @@ class VideoLooper:
         paths = self._reader.search_paths()
         # Enumerate all movie files inside those paths.
         movies = []
+        movies_append = movies.append
         for path in paths:
             # Skip paths that don't exist or are files.
-            if not os.path.exists(path) or not os.path.isdir(path):
+            if not os.path.isdir(path):
                 continue
 
-            for x in os.listdir(path):
-                # Ignore hidden files (useful when file loaded on USB key from an OSX computer)
-                if x[0] != '.' and re.search('\.({0})$'.format(self._extensions), x, flags=re.IGNORECASE):
-                    repeatsetting = re.search('_repeat_([0-9]*)x', x, flags=re.IGNORECASE)
-                    if (repeatsetting is not None):
-                        repeat = repeatsetting.group(1)
-                    else:
-                        repeat = 1
-                    basename, extension = os.path.splitext(x)
-                    movies.append(Movie('{0}/{1}'.format(path.rstrip('/'), x), basename, repeat))
+            alsa_entry = None
+            sound_entry = None
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    # Skip directories, the cached dirent type makes this free
+                    # for everything but symlinks.
+                    if not entry.is_file():
+                        continue
+                    x = entry.name
+                    # Remember the volume files while walking the directory.
+                    if self._alsa_hw_vol_file and x == self._alsa_hw_vol_file:
+                        alsa_entry = entry
+                    elif self._sound_vol_file and x == self._sound_vol_file:
+                        sound_entry = entry
+                    # Ignore hidden files (useful when file loaded on USB key from an OSX computer)
+                    if x[0] != '.' and self._ext_re.search(x):
+                        repeatsetting = self._repeat_re.search(x)
+                        if (repeatsetting is not None):
+                            repeat = repeatsetting.group(1)
+                        else:
+                            repeat = 1
+                        basename, extension = os.path.splitext(x)
+                        movies_append(Movie(entry.path, basename, repeat))
 
             # Get the ALSA hardware volume from the file in the USB key
-            if self._alsa_hw_vol_file:
-                alsa_hw_vol_file_path = '{0}/{1}'.format(path.rstrip('/'), self._alsa_hw_vol_file)
-                if os.path.exists(alsa_hw_vol_file_path):
-                    with open(alsa_hw_vol_file_path, 'r') as alsa_hw_vol_file:
+            if alsa_entry:
+                try:
+                    with open(alsa_entry.path, 'r') as alsa_hw_vol_file:
                         alsa_hw_vol_string = alsa_hw_vol_file.readline()
                         self._alsa_hw_vol = alsa_hw_vol_string
+                except OSError:
+                    pass
 
             # Get the video volume from the file in the USB key
-            if self._sound_vol_file:
-                sound_vol_file_path = '{0}/{1}'.format(path.rstrip('/'), self._sound_vol_file)
-                if os.path.exists(sound_vol_file_path):
-                    with open(sound_vol_file_path, 'r') as sound_file:
+            if sound_entry:
+                try:
+                    with open(sound_entry.path, 'r') as sound_file:
                         sound_vol_string = sound_file.readline()
-                        if self._is_number(sound_vol_string):
-                            self._sound_vol = int(float(sound_vol_string))
+                except OSError:
+                    sound_vol_string = None
+                try:
+                    self._sound_vol = int(float(sound_vol_string))
+                except (ValueError, TypeError):
+                    pass
         # Create a playlist with the sorted list of movies.
-        return Playlist(sorted(movies))
+        # Sort by the target string directly so the comparisons run in C
+        # instead of going through Movie.__lt__.
+        movies.sort(key=attrgetter('target'))
+        return Playlist(movies)
 
     def _blank_screen(self):
         """Render a blank screen filled with the background color and optional the background image."""
         self._screen.fill(self._bgcolor)
-        if self._bgimage[0] is not None:
+        if self._has_bgimage:
             self._screen.blit(self._bgimage[0], (self._bgimage[1], self._bgimage[2]))
         pygame.display.flip()
 
+    def _clear_rect(self, rect):
+        """Redraw the background color and optional background image inside
+        the provided rect only, without updating the display.
+        """
+        self._screen.set_clip(rect)
+        self._screen.fill(self._bgcolor)
+        if self._has_bgimage:
+            self._screen.blit(self._bgimage[0], (self._bgimage[1], self._bgimage[2]))
+        self._screen.set_clip(None)
+
+    def _font(self, size):
+        """Return the default pygame font at the provided size, initializing
+        the font module and creating the font on first use.
+        """
+        font = self._fonts.get(size)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self._fonts[size] = pygame.font.Font(None, size)
+        return font
+
+    @property
+    def _small_font(self):
+        return self._font(50)
+
+    @property
+    def _medium_font(self):
+        return self._font(96)
+
+    @property
+    def _big_font(self):
+        return self._font(250)
+
     def _render_text(self, message, font=None):
         """Draw the provided message and return as pygame surface of it rendered
         with the configured foreground and background color.
@@ -288,7 +340,7 @@ class VideoLooper:
         # Default to small font if not provided.
         if font is None:
             font = self._small_font
-        return font.render(message, True, self._fgcolor, self._bgcolor)
+        return font.render(message, True, self._fgcolor, self._bgcolor).convert()
 
     def _animate_countdown(self, playlist):
         """Print text with the number of loaded movies and a quick countdown
@@ -309,73 +361,75 @@ class VideoLooper:
         l1x = (self._size[0] - l1w) // 2
         # Get static height position for both labels.
         y = (self._size[1] - l1h) // 2
+        # Render every countdown digit up front so no text rendering happens
+        # inside the once-per-second animation loop.
+        digits = [self._render_text(str(i), font=self._big_font)
+                  for i in range(self._countdown_time, 0, -1)]
+        # Centered position of each digit below label 1.
+        positions = [((self._size[0] - label2.get_width()) // 2, y + l1h) for label2 in digits]
+        # Blank screen and render the first label with the number of movies,
+        # it stays on screen for the whole countdown.
+        self._blank_screen()
+        dirty_rects = [self._screen.blit(label1, (l1x, y))]
+        prev_rect = None
         # Create a countdown animation for each second in the countdown.
-        for i in range(self._countdown_time, 0, -1):
-            # Blank screen.
-            self._blank_screen()
-            # Render the first label with the number of movies.
-            self._screen.blit(label1, (l1x, y))
-            # Render the second label with the countdown.
-            label2 = self._render_text(str(i), font=self._big_font)
-            l2w, l2h = label2.get_size()
-            # Static X position for label 2.
-            l2x = (self._size[0] - l2w) // 2
+        for label2, l2pos in zip(digits, positions):
+            # Clear only the area of the previous digit.
+            if prev_rect is not None:
+                self._clear_rect(prev_rect)
+                dirty_rects.append(prev_rect)
             # Render the second label with countdown.
-            self._screen.blit(label2, (l2x, y + l1h))
-            # Update display.
-            pygame.display.flip()
+            prev_rect = self._screen.blit(label2, l2pos)
+            dirty_rects.append(prev_rect)
+            # Update only the changed areas of the display.
+            pygame.display.update(dirty_rects)
+            dirty_rects = []
             # Wait for 1 second.
             time.sleep(1)
         # Blank screen and continue.
         self._blank_screen()
 
-    def _handle_keyboard_shortcuts(self):
-        """Keyboard handler thread to listen for shortcuts and handle them."""
-        # Register a handler for the control-c signal to cleanly exit the thread.
-        signal.signal(signal.SIGINT, self._handle_exit_signal)
-        while self._running:
-            for event in pygame.event.get():
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
-                        # Exit the application when the 'Esc' key is pressed.
-                        self._running = False
-                    elif event.key == pygame.K_SPACE:
-                        # Pause or unpause playback when the 'Space' key is pressed.
-                        self._player.toggle_pause()
-                    elif event.key == pygame.K_RIGHT:
-                        # Play next video when the right arrow key is pressed.
-                        self._play_next()
-                    elif event.key == pygame.K_LEFT:
-                        # Play previous video when the left arrow key is pressed.
-                        self._play_previous()
-                    elif event.key == pygame.K_r:
-                        # Reload the playlist when the 'r' key is pressed.
-                        self._playlist = self._build_playlist()
-                        self._play_next()
-                    elif event.key == pygame.K_s:
-                        # Stop playback when the 's' key is pressed.
-                        self._player.stop()
-                    elif event.key == pygame.K_MINUS:
-                        # Decrease volume when the '-' key is pressed.
-                        self._player.decrease_volume()
-                    elif event.key == pygame.K_PLUS or event.key == pygame.K_KP_PLUS:
-                        # Increase volume when the '+' key or numeric '+' key is pressed.
-                        self._player.increase_volume()
-                    elif event.key == pygame.K_m:
-                        # Toggle mute when the 'm' key is pressed.
-                        self._player.toggle_mute()
-                    elif event.key == pygame.K_UP:
-                        # Go to the next playlist entry when the 'Up' key is pressed.
-                        self._play_next()
-                    elif event.key == pygame.K_DOWN:
-                        # Go to the previous playlist entry when the 'Down' key is pressed.
-                        self._play_previous()
-            # Sleep briefly to avoid hogging the CPU.
-            time.sleep(0.1)
+    def _quit(self):
+        """Stop the main loop so the application exits."""
+        self._running = False
+
+    def _reload_playlist(self):
+        """Rebuild the playlist and start playing it."""
+        self._playlist = self._build_playlist()
+        self._play_next()
+
+    def _build_key_actions(self):
+        """Return a dict mapping pygame key codes to the handler for that
+        keyboard shortcut.
+        """
+        return {
+            pygame.K_ESCAPE:   self._quit,                     # Exit the application.
+            pygame.K_SPACE:    self._player.toggle_pause,      # Pause or unpause playback.
+            pygame.K_RIGHT:    self._play_next,                # Play next video.
+            pygame.K_LEFT:     self._play_previous,            # Play previous video.
+            pygame.K_r:        self._reload_playlist,          # Reload the playlist.
+            pygame.K_s:        self._player.stop,              # Stop playback.
+            pygame.K_MINUS:    self._player.decrease_volume,   # Decrease volume.
+            pygame.K_PLUS:     self._player.increase_volume,   # Increase volume.
+            pygame.K_KP_PLUS:  self._player.increase_volume,   # Increase volume (numeric keypad).
+            pygame.K_m:        self._player.toggle_mute,       # Toggle mute.
+            pygame.K_UP:       self._play_next,                # Go to the next playlist entry.
+            pygame.K_DOWN:     self._play_previous,            # Go to the previous playlist entry.
+        }
+
+    def _wake_up(self):
+        """Wake up the main loop, safe to call from any thread."""
+        try:
+            pygame.event.post(pygame.event.Event(WAKEUP_EVENT))
+        except pygame.error:
+            # pygame was already shut down, e.g. the player exiting on stop()
+            # right before pygame.quit() at the end of run().
+            pass
 
     def _handle_exit_signal(self, signal, frame):
-        """Handler for the control-c signal to cleanly exit the keyboard thread."""
+        """Handler for the control-c signal to cleanly exit the main loop."""
         self._running = False
+        self._wake_up()
 
     def _play_next(self):
         """Play the next video in the playlist."""
@@ -405,20 +459,31 @@ class VideoLooper:
             self._print(f'gpio control disabled while playback is running')
             return
         
-        action = self._pinMap[str(pin)]
+        kind, action = self._pinAction[pin]
 
-        self._print(f'pin {pin} triggered: {action}')
+        self._print(f'pin {pin} triggered: {self._pinMap[str(pin)]}')
         
-        if action in ['K_ESCAPE', 'K_k', 'K_s', 'K_SPACE', 'K_p', 'K_b', 'K_o', 'K_i']:
-            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=getattr(pygame, action, None)))
+        if kind == 'key':
+            # The posted key event wakes up the main loop by itself.
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=action))
         else:
             self._playlist.set_next(action)
             self._player.stop(3)
             self._playbackStopped = False
+            self._wake_up()
     
     def _gpio_setup(self):
         if self._pinMap == None:
             return
+        import RPi.GPIO as GPIO
+        # Resolve each pin's action once here instead of on every trigger:
+        # either a pygame key code to post or a playlist target to jump to.
+        self._pinAction = {}
+        for pin, action in self._pinMap.items():
+            if action in ['K_ESCAPE', 'K_k', 'K_s', 'K_SPACE', 'K_p', 'K_b', 'K_o', 'K_i']:
+                self._pinAction[int(pin)] = ('key', getattr(pygame, action, None))
+            else:
+                self._pinAction[int(pin)] = ('playlist', action)
         GPIO.setmode(GPIO.BOARD)
         for pin in self._pinMap:
             GPIO.setup(int(pin), GPIO.IN, pull_up_down=GPIO.PUD_UP)
@@ -438,26 +503,55 @@ class VideoLooper:
         # Animate the countdown.
         if self._countdown_time > 0:
             self._animate_countdown(self._playlist)
+        # Time to start the next video once the current one finished, so
+        # wait_time is still waited between videos.
+        next_play_at = None
+        # Check at least every second (the player wakes us up at the end of a
+        # video anyway), or sooner if the next video is due.  Tracked as a
+        # deadline so a stream of unrelated events can't postpone the check.
+        next_check_at = time.monotonic() + 1
         # Main loop to watch for changes and play videos.
         while self._running:
+            deadline = next_check_at
+            if next_play_at is not None and not self._playbackStopped:
+                deadline = min(deadline, next_play_at)
+            timeout = max(int((deadline - time.monotonic()) * 1000), 1)
+            # Block until a key press, a wake up event or the timeout elapsed.
+            event = pygame.event.wait(timeout)
+            if event.type == pygame.KEYDOWN:
+                if self._keyboard_control:
+                    action = self._key_actions.get(event.key)
+                    if action is not None:
+                        action()
+            # Any other event only runs the checks once the deadline passed.
+            now = time.monotonic()
+            if event.type != WAKEUP_EVENT and now < deadline:
+                continue
+            next_check_at = now + 1
             if not self._playbackStopped:
-                # Check if the current video has finished playing.
-                if self._player.finished():
+                # Check if the current video has finished playing and schedule
+                # the next one after the wait time.
+                if self._player.is_playing():
+                    next_play_at = None
+                elif next_play_at is None:
+                    next_play_at = time.monotonic() + self._wait_time
+                if next_play_at is not None and time.monotonic() >= next_play_at:
+                    next_play_at = None
                     self._play_next()
-                # Check for any changes to the file system.
-                new_playlist = self._build_playlist()
-                if new_playlist != self._playlist:
-                    # If the new playlist is different from the old one, update it.
-                    self._playlist = new_playlist
-                    self._print('Updating playlist...')
-                    self._play_next()  # Start playing the new playlist from the beginning.
-                time.sleep(self._wait_time)
-            else:
-                time.sleep(1)  # Wait for 1 second if playback is stopped.
+                # Only rebuild the playlist when the file reader reports a change,
+                # like a USB drive being inserted.
+                if self._reader.is_changed():
+                    new_playlist = self._build_playlist()
+                    if new_playlist.signature() != self._playlist.signature():
+                        # If the new playlist is different from the old one, update it.
+                        self._playlist = new_playlist
+                        self._print('Updating playlist...')
+                        self._play_next()  # Start playing the new playlist from the beginning.
 
         # Clean up and exit.
         self._player.stop()
         if self._pinMap:
+            import RPi.GPIO as GPIO
             GPIO.cleanup()
             
         pygame.quit()
@@ -467,4 +561,6 @@ if __name__ == '__main__':
     config_path = sys.argv[1] if len(sys.argv) > 1 else '/boot/video_looper.ini'
     # Create an instance of the video looper and run it.
     video_looper = VideoLooper(config_path)
+    # Register a handler for the control-c signal to cleanly exit.
+    signal.signal(signal.SIGINT, video_looper._handle_exit_signal)
     video_looper.run()
@@ -42,6 +42,8 @@ mkdir -p /home/pi/video # create default video directory
 chown pi:pi /home/pi/video
 
 pip3 install setuptools
+# The looper needs pygame 2 (pygame.event.wait timeout), older distros ship 1.9
+pip3 install "pygame>=2.0"
 python3 setup.py install --force
 
 cp ./assets/video_looper.ini /boot/video_looper.ini